@@ -0,0 +1,223 @@
+import atexit
+import json
+import os
+import threading
+from datetime import datetime, date
+from time import monotonic, sleep
+from flask import session, has_request_context
+from sqlalchemy import event, inspect, insert
+from sqlalchemy.exc import SQLAlchemyError
+from models import db, Doctor, Patient, Appointment, Treatment, AuditLog
+
+AUDITED = (Doctor, Patient, Appointment, Treatment)
+MASKED = {'password_hash'}
+
+#Committed changes waiting to be written; shared by all requests in this worker.
+#Each worker process has its own buffer, flusher thread and at-exit flush, so a
+#hard-killed worker can lose at most AUDIT_FLUSH_SECONDS worth of records.
+_buffer = []
+_buffer_started = None
+_lock = threading.Lock()
+_app = None
+_flusher_pid = None
+#After a failed flush, retries wait AUDIT_FLUSH_SECONDS doubling up to AUDIT_MAX_BACKOFF_SECONDS
+_failures = 0
+_retry_at = 0.0
+_dropped = 0
+
+def _jsonable(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if value is None or isinstance(value, (int, float, bool, str)):
+        return value
+    return str(value)
+
+def _normalized(value):
+    #Form posts assign '' and numeric strings to nullable/Integer columns; compare loosely
+    value = _jsonable(value)
+    if value == '':
+        return None
+    return None if value is None else str(value)
+
+def _changes(obj, action):
+    #{column: [before, after]} for every column touched by this flush
+    changes = {}
+    state = inspect(obj)
+    for attr in state.mapper.column_attrs:
+        if action == 'update':
+            hist = state.attrs[attr.key].history
+            if not hist.has_changes():
+                continue
+            before = hist.deleted[0] if hist.deleted else None
+            after = hist.added[0] if hist.added else None
+        elif action == 'insert':
+            before, after = None, getattr(obj, attr.key)
+        else:
+            before, after = getattr(obj, attr.key), None
+        if _normalized(before) == _normalized(after):
+            continue
+        if attr.key in MASKED:
+            before = '***' if before is not None else None
+            after = '***' if after is not None else None
+        changes[attr.key] = [_jsonable(before), _jsonable(after)]
+    return changes
+
+def _actor():
+    if has_request_context() and session.get('user_type'):
+        return f"{session['user_type']}:{session.get('user_id')}"
+    return None
+
+def _after_flush(sess, flush_context):
+    #Runs while pre-flush history is still available and new rows already have ids
+    pending = sess.info.setdefault('audit_pending', [])
+    now = datetime.utcnow()
+    actor = _actor()
+    for action, objs in (('insert', sess.new), ('update', sess.dirty), ('delete', sess.deleted)):
+        for obj in objs:
+            if not isinstance(obj, AUDITED):
+                continue
+            changes = _changes(obj, action)
+            if action == 'update' and not changes:
+                continue
+            pending.append({
+                'created_at': now,
+                'entity_type': type(obj).__name__,
+                'entity_id': obj.id,
+                'action': action,
+                'actor': actor,
+                'changes': json.dumps(changes, separators=(',', ':')),
+            })
+
+def _trim_buffer():
+    #Caller holds _lock. While the log cannot be written, keep the newest records only
+    global _dropped
+    limit = _app.config['AUDIT_MAX_BUFFER'] if _app is not None else None
+    if limit and len(_buffer) > limit:
+        excess = len(_buffer) - limit
+        del _buffer[:excess]
+        _dropped += excess
+
+def _after_commit(sess):
+    global _buffer_started
+    pending = sess.info.pop('audit_pending', None)
+    if not pending:
+        return
+    with _lock:
+        if not _buffer:
+            _buffer_started = monotonic()
+        _buffer.extend(pending)
+        _trim_buffer()
+    _ensure_flusher()
+
+def _after_rollback(sess):
+    sess.info.pop('audit_pending', None)
+
+def flush_audit_log():
+    #Write everything buffered so far as one multi-row insert in its own transaction.
+    #On failure the rows go back to the front of the buffer and the error is re-raised.
+    global _buffer_started
+    with _lock:
+        rows = _buffer[:]
+        _buffer.clear()
+        started, _buffer_started = _buffer_started, None
+    if not rows:
+        return 0
+    try:
+        with db.engine.begin() as conn:
+            conn.execute(insert(AuditLog.__table__), rows)
+    except SQLAlchemyError:
+        with _lock:
+            _buffer[:0] = rows
+            _buffer_started = started if started is not None else monotonic()
+            _trim_buffer()
+        raise
+    return len(rows)
+
+def _safe_flush(app, force=False):
+    #Flush unless a recent failure put retries on hold; failures are logged, never raised
+    global _failures, _retry_at, _dropped
+    if not force and monotonic() < _retry_at:
+        return
+    try:
+        flush_audit_log()
+    except SQLAlchemyError:
+        _failures += 1
+        delay = min(app.config['AUDIT_FLUSH_SECONDS'] * 2 ** (_failures - 1),
+                    app.config['AUDIT_MAX_BACKOFF_SECONDS'])
+        _retry_at = monotonic() + delay
+        if _failures == 1:
+            app.logger.exception('Audit log flush failed; %d records kept for retry', len(_buffer))
+        else:
+            app.logger.error('Audit log flush failed %d times; %d records buffered, retrying in %ds',
+                             _failures, len(_buffer), delay)
+    else:
+        _failures, _retry_at = 0, 0.0
+    with _lock:
+        dropped, _dropped = _dropped, 0
+    if dropped:
+        app.logger.error('Audit buffer full: %d oldest records were dropped', dropped)
+
+def _flush_if_due(app):
+    with _lock:
+        due = _buffer and (len(_buffer) >= app.config['AUDIT_BATCH_SIZE']
+                           or monotonic() - _buffer_started >= app.config['AUDIT_FLUSH_SECONDS'])
+    if due:
+        _safe_flush(app)
+
+def _flusher_loop(app):
+    while True:
+        sleep(app.config['AUDIT_FLUSH_SECONDS'])
+        if _buffer:
+            with app.app_context():
+                _safe_flush(app)
+
+def _ensure_flusher():
+    #Started on first use rather than at import, so every forked worker gets its own thread
+    global _flusher_pid
+    if _app is None or _flusher_pid == os.getpid():
+        return
+    with _lock:
+        if _flusher_pid == os.getpid():
+            return
+        _flusher_pid = os.getpid()
+    threading.Thread(target=_flusher_loop, args=(_app,), name='audit-flusher', daemon=True).start()
+
+def init_audit(app):
+    global _app
+    _app = app
+    app.config.setdefault('AUDIT_BATCH_SIZE', 50)
+    app.config.setdefault('AUDIT_FLUSH_SECONDS', 5)
+    app.config.setdefault('AUDIT_MAX_BACKOFF_SECONDS', 300)
+    app.config.setdefault('AUDIT_MAX_BUFFER', 10000)
+    if not event.contains(db.session, 'after_flush', _after_flush):
+        event.listen(db.session, 'after_flush', _after_flush)
+        event.listen(db.session, 'after_commit', _after_commit)
+        event.listen(db.session, 'after_rollback', _after_rollback)
+
+    @app.teardown_appcontext
+    def audit_teardown(exc):
+        _flush_if_due(app)
+
+    def flush_at_exit():
+        with app.app_context():
+            _safe_flush(app, force=True)
+    atexit.register(flush_at_exit)
+
+def query_audit(entity_type, entity_id=None, since=None, until=None, limit=200):
+    #Newest first; served by the (entity_type, entity_id, created_at) index, or by
+    #(entity_type, created_at) when no entity id is given.
+    #Only this worker's buffer is flushed first; other workers' changes show up
+    #once their flusher runs, i.e. within AUDIT_FLUSH_SECONDS.
+    if _app is not None:
+        _safe_flush(_app)
+    q = AuditLog.query.filter(AuditLog.entity_type == entity_type)
+    if entity_id is not None:
+        q = q.filter(AuditLog.entity_id == entity_id)
+    if since is not None:
+        q = q.filter(AuditLog.created_at >= since)
+    if until is not None:
+        q = q.filter(AuditLog.created_at < until)
+    entries = q.order_by(AuditLog.created_at.desc(), AuditLog.id.desc()).limit(limit).all()
+    for e in entries:
+        e.change_set = json.loads(e.changes) if e.changes else {}
+    return entries
@@ -0,0 +1,83 @@
+"""Startup-time benchmark: import + app factory + first request, per worker.
+
+Each worker is a fresh interpreter, the same as a process in a multi-worker
+server, so module import costs are paid every time. The default first request
+is the admin dashboard, so engine/connection setup and the first queries are
+included. Without --db a temporary database is initialized once beforehand.
+
+    python bench_startup.py            # 4 workers
+    python bench_startup.py -w 8 -p /login --user-type none
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+WORKER = r'''
+import json, sys
+from time import perf_counter
+t0 = perf_counter()
+import app as hms
+t1 = perf_counter()
+app = hms.create_app({'SQLALCHEMY_DATABASE_URI': sys.argv[1]})
+t2 = perf_counter()
+client = app.test_client()
+if sys.argv[3] != 'none':
+    #Log in through the session cookie; not part of the timed request
+    with client.session_transaction() as s:
+        s['user_type'] = sys.argv[3]
+        s['user_id'] = 1
+t3 = perf_counter()
+resp = client.get(sys.argv[2])
+t4 = perf_counter()
+print(json.dumps({'import': t1 - t0, 'create_app': t2 - t1, 'first_request': t4 - t3,
+                  'total': (t2 - t0) + (t4 - t3), 'status': resp.status_code}))
+'''
+
+SETUP = r'''
+import sys
+import app as hms
+app = hms.create_app({'SQLALCHEMY_DATABASE_URI': sys.argv[1]})
+with app.app_context():
+    hms.init_db()
+'''
+
+def run_python(code, *args):
+    #Run from the repo root so `import app` resolves wherever the script is started from
+    return subprocess.run([sys.executable, '-c', code, *args], cwd=ROOT,
+                          capture_output=True, text=True, check=True)
+
+def run_worker(db_uri, path, user_type):
+    out = run_python(WORKER, db_uri, path, user_type)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-w', '--workers', type=int, default=4)
+    parser.add_argument('-p', '--path', default='/admin/dashboard')
+    parser.add_argument('--user-type', default='admin', choices=['admin', 'doctor', 'patient', 'none'],
+                        help='session role for the request (user id 1)')
+    parser.add_argument('--db', help='database URI; must already be initialized')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_uri = args.db
+        if not db_uri:
+            db_uri = 'sqlite:///' + os.path.join(tmp, 'bench.db')
+            run_python(SETUP, db_uri)
+        runs = [run_worker(db_uri, args.path, args.user_type) for _ in range(args.workers)]
+
+    print(f"{'worker':>6} {'import':>9} {'create_app':>11} {'first_req':>10} {'total':>9}  status")
+    for i, r in enumerate(runs, 1):
+        print(f"{i:>6} {r['import'] * 1000:>7.1f}ms {r['create_app'] * 1000:>9.1f}ms "
+              f"{r['first_request'] * 1000:>8.1f}ms {r['total'] * 1000:>7.1f}ms  {r['status']}")
+    for key in ('import', 'create_app', 'first_request', 'total'):
+        print(f"median {key}: {statistics.median(r[key] for r in runs) * 1000:.1f}ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+from flask import Blueprint, render_template, request, redirect, url_for, session, flash, current_app
+from datetime import datetime, date, timedelta
+from sqlalchemy import or_
+from models import db, Doctor, Patient, Appointment, Department
+from audit import AUDITED, query_audit
+
+bp = Blueprint('admin', __name__)
+
+@bp.route('/dashboard')
+def admin_dashboard():
+    if session.get('user_type') != 'admin':
+        return redirect(url_for('main.login'))
+    
+    total_doctors = Doctor.query.filter_by(is_active=True).count()
+    total_patients = Patient.query.filter_by(is_active=True).count()
+    total_appointments = Appointment.query.count()
+    upcoming_appointments = Appointment.query.filter(
+        Appointment.date >= date.today(),
+        Appointment.status == 'Booked'
+    ).order_by(Appointment.date, Appointment.time).all()
+    
+    registered_patients = Patient.query.order_by(Patient.created_at.desc()).all()
+    registered_doctors = Doctor.query.order_by(Doctor.created_at.desc()).all()
+    
+    search_query = request.args.get('search', '')
+    search_results = {'patients': [], 'doctors': []}
+    if search_query:
+        search_results['patients'] = Patient.query.filter(
+            or_(Patient.name.ilike(f'%{search_query}%'), 
+                Patient.username.ilike(f'%{search_query}%'), 
+                Patient.contact.ilike(f'%{search_query}%'))).all()
+        search_results['doctors'] = Doctor.query.join(Department).filter(
+            or_(Doctor.name.ilike(f'%{search_query}%'), 
+                Doctor.username.ilike(f'%{search_query}%'), 
+                Department.name.ilike(f'%{search_query}%'))).all()
+    
+    return render_template('admin_dashboard.html',
+                           total_doctors=total_doctors,
+                           total_patients=total_patients,
+                           total_appointments=total_appointments,
+                           upcoming_appointments=upcoming_appointments,
+                           registered_patients=registered_patients,
+                           registered_doctors=registered_doctors,
+                           search_query=search_query,
+                           search_results=search_results)
+
+@bp.route('/add_doctor', methods=['GET', 'POST'])
+def add_doctor():
+    if session.get('user_type') != 'admin':
+        return redirect(url_for('main.login'))
+    departments = Department.query.all()
+    if request.method == 'POST':
+        username = request.form.get('username')
+        email = request.form.get('email')
+        if (
+            Doctor.query.filter_by(username=username).first()
+            or Patient.query.filter_by(username=username).first()
+        ):
+            flash('Username already exists', 'danger')
+            return redirect(url_for('admin.add_doctor'))
+        if Doctor.query.filter_by(email=email).first():
+            flash('Email already exists', 'danger')
+            return redirect(url_for('admin.add_doctor'))
+        doctor = Doctor(
+            username=username,
+            email=email,
+            name=request.form.get('name'),
+            department_id=request.form.get('department_id'),
+            specialization=request.form.get('specialization'),
+            experience=request.form.get('experience'),
+            contact=request.form.get('contact')
+        )
+        doctor.set_password(request.form.get('password'))
+        db.session.add(doctor)
+        db.session.commit()
+        flash('Doctor added successfully!', 'success')
+        return redirect(url_for('admin.admin_dashboard'))
+    return render_template('add_doctor.html', departments=departments)
+
+@bp.route('/edit_doctor/<int:doctor_id>', methods=['GET', 'POST'])
+def edit_doctor(doctor_id):
+    if session.get('user_type') != 'admin':
+        return redirect(url_for('main.login'))
+    doctor = Doctor.query.get_or_404(doctor_id)
+    departments = Department.query.all()
+    if request.method == 'POST':
+        doctor.name = request.form.get('name')
+        doctor.department_id = request.form.get('department_id')
+        doctor.specialization = request.form.get('specialization')
+        doctor.experience = request.form.get('experience')
+        doctor.contact = request.form.get('contact')
+        db.session.commit()
+        flash('Doctor updated successfully!', 'success')
+        return redirect(url_for('admin.admin_dashboard'))
+    return render_template('edit_doctor.html', doctor=doctor, departments=departments)
+
+@bp.route('/delete_doctor/<int:doctor_id>')
+def delete_doctor(doctor_id):
+    if session.get('user_type') != 'admin':
+        return redirect(url_for('main.login'))
+    doctor = Doctor.query.get_or_404(doctor_id)
+    doctor.is_active = False  #blacklisting
+    db.session.commit()
+    flash('Doctor deactivated (blacklisted).', 'success')
+    return redirect(url_for('admin.admin_dashboard'))
+
+@bp.route('/activate_doctor/<int:doctor_id>')
+def activate_doctor(doctor_id):
+    if session.get('user_type') != 'admin':
+        return redirect(url_for('main.login'))
+    doctor = Doctor.query.get_or_404(doctor_id)
+    doctor.is_active = True
+    db.session.commit()
+    flash('Doctor activated successfully!', 'success')
+    return redirect(url_for('admin.admin_dashboard'))
+
+@bp.route('/edit_patient/<int:patient_id>', methods=['GET', 'POST'])
+def edit_patient(patient_id):
+    if session.get('user_type') != 'admin':
+        return redirect(url_for('main.login'))
+    patient = Patient.query.get_or_404(patient_id)
+    if request.method == 'POST':
+        patient.name = request.form.get('name')
+        patient.age = request.form.get('age')
+        patient.gender = request.form.get('gender')
+        patient.contact = request.form.get('contact')
+        patient.address = request.form.get('address')
+        db.session.commit()
+        flash('Patient updated successfully!', 'success')
+        return redirect(url_for('admin.admin_dashboard'))
+    return render_template('edit_patient.html', patient=patient)
+
+@bp.route('/delete_patient/<int:patient_id>')
+def delete_patient(patient_id):
+    if session.get('user_type') != 'admin':
+        return redirect(url_for('main.login'))
+    patient = Patient.query.get_or_404(patient_id)
+    patient.is_active = False
+    db.session.commit()
+    flash('Patient deactivated (blacklisted).', 'success')
+    return redirect(url_for('admin.admin_dashboard'))
+
+@bp.route('/activate_patient/<int:patient_id>')
+def activate_patient(patient_id):
+    if session.get('user_type') != 'admin':
+        return redirect(url_for('main.login')) 
+    patient = Patient.query.get_or_404(patient_id)
+    patient.is_active = True
+    db.session.commit()
+    flash('Patient activated successfully!', 'success')
+    return redirect(url_for('admin.admin_dashboard'))
+
+@bp.route('/appointments')
+def admin_appointments():
+    if session.get('user_type') != 'admin':
+        return redirect(url_for('main.login'))
+    appointments = (
+        Appointment.query
+        .order_by(Appointment.date.desc(), Appointment.time.desc())
+        .all()
+    )
+    show_id = request.args.get('show', type=int)
+    highlight = Appointment.query.get(show_id) if show_id else None
+    return render_template('admin_appointments.html', appointments=appointments, highlight=highlight)
+
+@bp.route('/audit')
+def audit_log():
+    if session.get('user_type') != 'admin':
+        return redirect(url_for('main.login'))
+    entity_types = [m.__name__ for m in AUDITED]
+    entity_type = request.args.get('entity_type', entity_types[0])
+    if entity_type not in entity_types:
+        entity_type = entity_types[0]
+    entity_id = request.args.get('entity_id', type=int)
+    since = until = None
+    try:
+        since = datetime.strptime(request.args.get('since', ''), '%Y-%m-%d')
+    except ValueError:
+        pass
+    try:
+        until = datetime.strptime(request.args.get('until', ''), '%Y-%m-%d') + timedelta(days=1)
+    except ValueError:
+        pass
+    entries = query_audit(entity_type, entity_id=entity_id, since=since, until=until)
+    return render_template('admin_audit.html', entries=entries, entity_types=entity_types,
+                           flush_seconds=current_app.config['AUDIT_FLUSH_SECONDS'],
+                           entity_type=entity_type, entity_id=entity_id,
+                           since=request.args.get('since', ''), until=request.args.get('until', ''))
@@ -0,0 +1,163 @@
+from flask import Blueprint, render_template, request, redirect, url_for, session, flash, jsonify
+from datetime import datetime, timedelta, date
+from models import db, Doctor, Patient, Appointment, Treatment, DoctorAvailability, DoctorPatientSummary
+from helpers import (record_visit, history_timeline, has_care_relationship, HISTORY_PAGE_SIZE, HISTORY_PREVIEW_CHARS,
+                     ROSTER_PAGE_SIZE)
+
+bp = Blueprint('doctor', __name__)
+
+@bp.route('/dashboard')
+def doctor_dashboard():
+    if session.get('user_type') != 'doctor':
+        return redirect(url_for('main.login'))
+    doctor = Doctor.query.get(session['user_id'])
+    today = date.today()
+    next_week = today + timedelta(days=7)
+    upcoming_appointments = Appointment.query.filter(
+        Appointment.doctor_id == doctor.id,
+        Appointment.date >= today,
+        Appointment.date <= next_week,
+        Appointment.status == 'Booked'
+    ).order_by(Appointment.date, Appointment.time).all()
+    page = request.args.get('page', 1, type=int)
+    roster = (
+        db.session.query(Patient, DoctorPatientSummary.visit_count, DoctorPatientSummary.last_visit)
+        .join(DoctorPatientSummary, DoctorPatientSummary.patient_id == Patient.id)
+        .filter(DoctorPatientSummary.doctor_id == doctor.id)
+        .order_by(DoctorPatientSummary.last_visit.desc(), Patient.id.desc())
+        .paginate(page=page, per_page=ROSTER_PAGE_SIZE, error_out=False)
+    )
+    return render_template('doctor_dashboard.html', doctor=doctor, 
+                           upcoming_appointments=upcoming_appointments, 
+                           roster=roster)
+
+@bp.route('/appointments')
+def doctor_appointments():
+    if session.get('user_type') != 'doctor':
+        return redirect(url_for('main.login'))
+    doctor = Doctor.query.get(session['user_id'])
+    appointments = (
+        Appointment.query.filter_by(doctor_id=doctor.id)
+        .order_by(Appointment.date.desc(), Appointment.time.desc())
+        .all()
+    )
+    return render_template('doctor_appointments.html', appointments=appointments)
+
+@bp.route('/complete_appointment/<int:appointment_id>', methods=['GET', 'POST'])
+def complete_appointment(appointment_id):
+    if session.get('user_type') != 'doctor':
+        return redirect(url_for('main.login'))
+    appointment = Appointment.query.get_or_404(appointment_id)
+    if appointment.status == 'Cancelled':
+        flash('Cancelled appointments cannot be completed.', 'warning')
+        return redirect(url_for('doctor.doctor_dashboard'))
+    if request.method == 'POST':
+        #Only a Booked -> Completed transition is a new visit; resubmitting just edits the treatment
+        if appointment.status == 'Booked':
+            record_visit(appointment)
+        appointment.status = 'Completed'
+        treatment = Treatment.query.filter_by(
+            appointment_id=appointment_id
+        ).first() or Treatment(appointment_id=appointment_id)
+        treatment.diagnosis = request.form.get('diagnosis')
+        treatment.prescription = request.form.get('prescription')
+        treatment.notes = request.form.get('notes')
+        db.session.add(treatment)
+        db.session.commit()
+        flash('Appointment completed successfully!', 'success')
+        return redirect(url_for('doctor.doctor_dashboard'))
+    return render_template('complete_appointment.html', appointment=appointment)
+
+@bp.route('/cancel_appointment/<int:appointment_id>')
+def doctor_cancel_appointment(appointment_id):
+    if session.get('user_type') != 'doctor':
+        return redirect(url_for('main.login'))
+    appointment = Appointment.query.get_or_404(appointment_id)
+    if appointment.status != 'Booked':
+        flash('Only booked appointments can be cancelled.', 'warning')
+        return redirect(url_for('doctor.doctor_dashboard'))
+    appointment.status = 'Cancelled'
+    db.session.commit()
+    flash('Appointment cancelled!', 'success')
+    return redirect(url_for('doctor.doctor_dashboard'))
+
+@bp.route('/patient_history/<int:patient_id>')
+def patient_history(patient_id):
+    if session.get('user_type') != 'doctor':
+        return redirect(url_for('main.login'))
+    patient = Patient.query.get_or_404(patient_id)
+    if not has_care_relationship(session['user_id'], patient_id):
+        flash('Unauthorized access', 'danger')
+        return redirect(url_for('doctor.doctor_dashboard'))
+    before = request.args.get('before')
+    full = request.args.get('full', type=int) == 1
+    entries, next_cursor = history_timeline(patient_id, before=before,
+                                            preview=0 if full else HISTORY_PREVIEW_CHARS)
+    return render_template('patient_history.html', patient=patient, entries=entries,
+                           next_cursor=next_cursor, before=before, full=full)
+
+@bp.route('/patient_history/<int:patient_id>/timeline')
+def patient_history_timeline(patient_id):
+    if session.get('user_type') != 'doctor':
+        return jsonify({'error': 'unauthorized'}), 401
+    Patient.query.get_or_404(patient_id)
+    if not has_care_relationship(session['user_id'], patient_id):
+        return jsonify({'error': 'forbidden'}), 403
+    limit = min(max(request.args.get('limit', HISTORY_PAGE_SIZE, type=int), 1), 100)
+    preview = max(request.args.get('preview', HISTORY_PREVIEW_CHARS, type=int), 0)
+    entries, next_cursor = history_timeline(patient_id, before=request.args.get('before'),
+                                            limit=limit, preview=preview)
+    for e in entries:
+        e['date'] = e['date'].isoformat()
+    return jsonify({'entries': entries, 'next_cursor': next_cursor})
+
+@bp.route('/treatment/<int:appointment_id>')
+def treatment_detail(appointment_id):
+    #Full text of a single visit, for expanding a truncated timeline entry
+    if session.get('user_type') != 'doctor':
+        return jsonify({'error': 'unauthorized'}), 401
+    treatment = Treatment.query.filter_by(appointment_id=appointment_id).first_or_404()
+    if not has_care_relationship(session['user_id'], treatment.appointment.patient_id):
+        return jsonify({'error': 'forbidden'}), 403
+    return jsonify({
+        'appointment_id': appointment_id,
+        'diagnosis': treatment.diagnosis,
+        'prescription': treatment.prescription,
+        'notes': treatment.notes,
+    })
+
+@bp.route('/availability', methods=['GET', 'POST'])
+def doctor_availability():
+    if session.get('user_type') != 'doctor':
+        return redirect(url_for('main.login'))
+    doctor = Doctor.query.get(session['user_id'])
+    if request.method == 'POST':
+        date_str = request.form.get('date')
+        start_time = request.form.get('start_time')
+        end_time = request.form.get('end_time')
+        av = DoctorAvailability(
+            doctor_id=doctor.id,
+            date=datetime.strptime(date_str, '%Y-%m-%d').date(),
+            start_time=start_time,
+            end_time=end_time
+        )
+        db.session.add(av)
+        db.session.commit()
+        flash('Availability added successfully!', 'success')
+        return redirect(url_for('doctor.doctor_availability'))
+    
+    today = date.today()
+    next_week = today + timedelta(days=7)
+    availabilities = (
+        DoctorAvailability.query
+        .filter(
+            DoctorAvailability.doctor_id == doctor.id,
+            DoctorAvailability.date >= today,
+            DoctorAvailability.date <= next_week
+        )
+        .order_by(DoctorAvailability.date)
+        .all()
+    )
+    time_slots = [(f"{h:02d}:{m:02d}", f"{h:02d}:{m:02d}") for h in range(6, 24) for m in (0, 30)]
+    return render_template('doctor_availability.html', availabilities=availabilities, 
+                           time_slots=time_slots)
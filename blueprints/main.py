@@ -0,0 +1,76 @@
+from flask import Blueprint, render_template, request, redirect, url_for, session, flash
+from sqlalchemy import or_
+from models import db, Admin, Doctor, Patient
+
+bp = Blueprint('main', __name__)
+
+@bp.route('/')
+def index():
+    return render_template('index.html')
+
+@bp.route('/login', methods=['GET', 'POST'])
+def login():
+    if request.method == 'POST':
+        username = request.form.get('username')
+        password = request.form.get('password')
+        admin = Admin.query.filter(or_(Admin.username == username, Admin.email == username)).first()
+        if admin and admin.check_password(password):
+            session['user_id'] = admin.id
+            session['user_type'] = 'admin'
+            session['username'] = admin.username
+            return redirect(url_for('admin.admin_dashboard'))
+        
+        doctor = Doctor.query.filter(or_(Doctor.username == username, Doctor.email == username)).first()
+        if doctor and doctor.check_password(password):
+            if not doctor.is_active:
+                flash('Your account has been deactivated. Contact admin.', 'danger')
+                return redirect(url_for('main.login'))
+            session['user_id'] = doctor.id
+            session['user_type'] = 'doctor'
+            session['username'] = doctor.username
+            return redirect(url_for('doctor.doctor_dashboard'))
+        
+        patient = Patient.query.filter(or_(Patient.username == username, Patient.email == username)).first()
+        if patient and patient.check_password(password):
+            if not patient.is_active:
+                flash('Your account has been deactivated. Contact admin.', 'danger')
+                return redirect(url_for('main.login'))
+            session['user_id'] = patient.id
+            session['user_type'] = 'patient'
+            session['username'] = patient.username
+            return redirect(url_for('patient.patient_dashboard'))
+        
+        flash('Invalid credentials', 'danger')
+    return render_template('login.html')
+
+@bp.route('/register', methods=['GET', 'POST'])
+def register():
+    if request.method == 'POST':
+        username = request.form.get('username')
+        email = request.form.get('email')
+        if Patient.query.filter_by(username=username).first() or Doctor.query.filter_by(username=username).first():
+            flash('Username already exists', 'danger')
+            return redirect(url_for('main.register'))
+        if Patient.query.filter_by(email=email).first():
+            flash('Email already exists', 'danger')
+            return redirect(url_for('main.register'))
+        patient = Patient(
+            username=username,
+            email=email,
+            name=request.form.get('name'),
+            age=request.form.get('age'),
+            gender=request.form.get('gender'),
+            contact=request.form.get('contact'),
+            address=request.form.get('address')
+        )
+        patient.set_password(request.form.get('password'))
+        db.session.add(patient)
+        db.session.commit()
+        flash('Registration successful! Please login.', 'success')
+        return redirect(url_for('main.login'))
+    return render_template('register.html')
+
+@bp.route('/logout')
+def logout():
+    session.clear()
+    return redirect(url_for('main.index'))
@@ -0,0 +1,207 @@
+from flask import Blueprint, render_template, request, redirect, url_for, session, flash
+from datetime import datetime, timedelta, date
+from sqlalchemy import or_
+from models import db, Doctor, Patient, Appointment, Department, DoctorAvailability
+from helpers import slots_for_doctor_date, week_slots_for_doctor, first_available_in_department, roster_entry
+
+bp = Blueprint('patient', __name__)
+
+FIRST_AVAILABLE_MAX_DAYS = 31
+
+@bp.route('/dashboard')
+def patient_dashboard():
+    if session.get('user_type') != 'patient':
+        return redirect(url_for('main.login'))
+    patient = Patient.query.get(session['user_id'])
+    departments = Department.query.all()
+    upcoming_appointments = (
+        Appointment.query.filter(
+            Appointment.patient_id == patient.id,
+            Appointment.date >= date.today(),
+            Appointment.status == "Booked",
+        )
+        .order_by(Appointment.date, Appointment.time)
+        .all()
+    )
+    today = date.today()
+    next_week = today + timedelta(days=7)
+    doctors_availability = (
+        db.session.query(Doctor, DoctorAvailability)
+        .join(DoctorAvailability, Doctor.id == DoctorAvailability.doctor_id)
+        .filter(
+            DoctorAvailability.date >= today,
+            DoctorAvailability.date <= next_week,
+            Doctor.is_active == True,
+        )
+        .all()
+    )
+    search_query = request.args.get('search','')
+    search_results = []
+    if search_query:
+        search_results = (
+            Doctor.query.join(Department)
+            .filter(
+                or_(
+                    Doctor.name.ilike(f"%{search_query}%"),
+                    Department.name.ilike(f"%{search_query}%"),
+                    Doctor.specialization.ilike(f"%{search_query}%"),
+                ),
+                Doctor.is_active == True,
+            )
+            .all()
+        )
+    return render_template('patient_dashboard.html', patient=patient, departments=departments, 
+                           upcoming_appointments=upcoming_appointments, doctors_availability=doctors_availability,
+                           search_query=search_query, search_results=search_results)
+
+@bp.route('/department/<int:dept_id>')
+def patient_department(dept_id):
+    if session.get('user_type') != 'patient':
+        return redirect(url_for('main.login'))
+    dept = Department.query.get_or_404(dept_id)
+    doctors = Doctor.query.filter_by(department_id=dept_id, is_active=True).all()
+    return render_template('patient_department.html', department=dept, doctors=doctors)
+
+@bp.route('/department/<int:dept_id>/first_available')
+def department_first_available(dept_id):
+    if session.get('user_type') != 'patient':
+        return redirect(url_for('main.login'))
+    dept = Department.query.get_or_404(dept_id)
+    today = date.today()
+    try:
+        start_day = datetime.strptime(request.args.get('start', ''), '%Y-%m-%d').date()
+    except ValueError:
+        start_day = today
+    start_day = max(start_day, today)
+    try:
+        end_day = datetime.strptime(request.args.get('end', ''), '%Y-%m-%d').date()
+    except ValueError:
+        end_day = start_day + timedelta(days=7)
+    end_day = min(max(end_day, start_day), start_day + timedelta(days=FIRST_AVAILABLE_MAX_DAYS))
+    time_options = [f"{h:02d}:{m:02d}" for h in range(6, 24) for m in (0, 30)] + ['24:00']
+    from_time = request.args.get('from_time')
+    if from_time not in time_options[:-1]:
+        from_time = '06:00'
+    to_time = request.args.get('to_time')
+    if to_time not in time_options[1:]:
+        to_time = '24:00'
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+    slots = first_available_in_department(dept_id, start_day, end_day, from_time, to_time, limit)
+    return render_template('department_first_available.html', department=dept, slots=slots,
+                           start=start_day, end=end_day, from_time=from_time, to_time=to_time,
+                           limit=limit, time_options=time_options)
+
+@bp.route('/profile', methods=['GET', 'POST'])
+def patient_profile():
+    if session.get('user_type') != 'patient':
+        return redirect(url_for('main.login'))
+    patient = Patient.query.get(session['user_id'])
+    if request.method == 'POST':
+        patient.name = request.form.get('name')
+        patient.age = request.form.get('age')
+        patient.gender = request.form.get('gender')
+        patient.contact = request.form.get('contact')
+        patient.address = request.form.get('address')
+        db.session.commit()
+        flash('Profile updated successfully!', 'success')
+        return redirect(url_for('patient.patient_dashboard'))
+    return render_template('patient_profile.html', patient=patient)
+
+@bp.route('/book_appointment/<int:doctor_id>', methods=['GET', 'POST'])
+def book_appointment(doctor_id):
+    if session.get('user_type') != 'patient':
+        return redirect(url_for('main.login'))
+    doctor = Doctor.query.get_or_404(doctor_id)
+    if not doctor.is_active:
+        flash('Doctor is not available for booking at the moment.', 'warning')
+        return redirect(url_for('patient.patient_dashboard'))
+    patient = Patient.query.get(session['user_id'])
+    if request.method == 'POST':
+        date_str = request.form.get('date')
+        time_str = request.form.get('time')
+        the_date = datetime.strptime(date_str, '%Y-%m-%d').date()
+        if time_str not in slots_for_doctor_date(doctor_id, the_date):
+            flash('Selected slot is no longer available. Please choose another.', 'danger')
+            return redirect(url_for('patient.book_appointment', doctor_id=doctor_id))
+        ap = Appointment(patient_id=patient.id, doctor_id=doctor_id, date=the_date, time=time_str)
+        db.session.add(ap)
+        roster_entry(doctor_id, patient.id)
+        db.session.commit()
+        flash('Appointment booked successfully!', 'success')
+        return redirect(url_for('patient.patient_dashboard'))
+    start_day = date.today()
+    week = week_slots_for_doctor(doctor_id, start_day)
+    return render_template('book_appointment.html', doctor=doctor, week=week)
+
+@bp.route('/cancel_appointment/<int:appointment_id>')
+def cancel_appointment(appointment_id):
+    if session.get('user_type') != 'patient':
+        return redirect(url_for('main.login'))
+    appointment = Appointment.query.get_or_404(appointment_id)
+    if appointment.patient_id != session['user_id']:
+        flash('Unauthorized access', 'danger')
+        return redirect(url_for('patient.patient_dashboard'))
+    if appointment.status != 'Booked':
+        flash('Only booked appointments can be cancelled.', 'warning')
+        return redirect(url_for('patient.appointment_history'))
+    appointment.status = 'Cancelled'
+    db.session.commit()
+    flash('Appointment cancelled successfully!', 'success')
+    return redirect(url_for('patient.patient_dashboard'))
+
+@bp.route('/reschedule_appointment/<int:appointment_id>', methods=['GET', 'POST'])
+def reschedule_appointment(appointment_id):
+    if session.get('user_type') != 'patient':
+        return redirect(url_for('main.login'))   
+    appointment = Appointment.query.get_or_404(appointment_id)   
+    if appointment.patient_id != session['user_id']:
+        flash('Unauthorized access', 'danger')
+        return redirect(url_for('patient.patient_dashboard'))    
+    if appointment.status != 'Booked':
+        flash('Only booked appointments can be rescheduled.', 'warning')
+        return redirect(url_for('patient.appointment_history'))   
+    doctor = appointment.doctor    
+    if request.method == 'POST':
+        new_date_str = request.form.get('date')
+        new_time = request.form.get('time')
+        new_date = datetime.strptime(new_date_str, '%Y-%m-%d').date()       
+        if new_time not in slots_for_doctor_date(doctor.id, new_date):
+            flash('Selected slot is no longer available. Please choose another.', 'danger')
+            return redirect(url_for('patient.reschedule_appointment', appointment_id=appointment_id))        
+        appointment.date = new_date
+        appointment.time = new_time
+        db.session.commit()
+        flash('Appointment rescheduled successfully!', 'success')
+        return redirect(url_for('patient.patient_dashboard')) 
+    start_day = date.today()
+    week = week_slots_for_doctor(doctor.id, start_day)   
+    return render_template('reschedule_appointment.html', appointment=appointment, doctor=doctor, week=week)
+
+@bp.route('/appointment_history')
+def appointment_history():
+    if session.get('user_type') != 'patient':
+        return redirect(url_for('main.login'))
+    patient = Patient.query.get(session['user_id'])
+    appointments = (
+        Appointment.query.filter_by(patient_id=patient.id)
+        .order_by(Appointment.date.desc(), Appointment.time.desc())
+        .all()
+    )
+    show_id = request.args.get('show', type=int)
+    highlight = Appointment.query.get(show_id) if show_id else None
+    return render_template('appointment_history.html',appointments=appointments,highlight=highlight)
+
+@bp.route('/doctor_profile/<int:doctor_id>')
+def doctor_profile(doctor_id):
+    if session.get('user_type') != 'patient':
+        return redirect(url_for('main.login'))
+    doctor = Doctor.query.get_or_404(doctor_id)
+    if not doctor.is_active:
+        flash('This doctor is currently unavailable.', 'warning')
+        return redirect(url_for('patient.patient_dashboard'))
+    today = date.today()
+    next_week = today + timedelta(days=7)
+    availabilities = DoctorAvailability.query.filter(DoctorAvailability.doctor_id==doctor_id, 
+                                                     DoctorAvailability.date>=today, 
+                                                     DoctorAvailability.date<=next_week).order_by(DoctorAvailability.date).all()
+    return render_template('doctor_profile.html', doctor=doctor, availabilities=availabilities)
@@ -0,0 +1,206 @@
+from datetime import datetime, timedelta, date, time as dtime
+from collections import defaultdict
+from itertools import islice
+import heapq
+from sqlalchemy import or_, and_, func, insert, case
+from models import db, Doctor, Appointment, Treatment, Department, DoctorAvailability, DoctorPatientSummary
+
+def parse_hhmm(s: str) -> dtime:
+    h, m = s.split(':')
+    return dtime(hour=int(h), minute=int(m))
+
+def time_range_slots(start: str, end: str, step_minutes: int = 30):
+    #HH:MM every 30 minutes
+    st = parse_hhmm(start)
+    en = parse_hhmm(end)
+    cur = st
+    while (cur.hour, cur.minute) < (en.hour, en.minute):
+        yield f"{cur.hour:02d}:{cur.minute:02d}"
+        minute = (cur.minute + step_minutes)
+        hour = cur.hour + minute // 60
+        minute = minute % 60
+        cur = dtime(hour=hour, minute=minute)
+
+def slots_for_doctor_date(doctor_id: int, the_date: date):
+    #All bookable HH:MM for doctor on a date 
+    windows = DoctorAvailability.query.filter_by(doctor_id=doctor_id, date=the_date).all()
+    allowed = set()
+    for w in windows:
+        for s in time_range_slots(w.start_time, w.end_time):
+            allowed.add(s)
+    # Remove already booked slots
+    booked = Appointment.query.filter_by(doctor_id=doctor_id, date=the_date, status='Booked').all()
+    booked_times = {a.time for a in booked}
+    available = [t for t in allowed if t not in booked_times]
+    # If booking for today, hide slots in the past
+    if the_date == date.today():
+        now_time = datetime.now().time()
+        available = [t for t in available if parse_hhmm(t) >= now_time]
+    return sorted(available)
+
+def week_slots_for_doctor(doctor_id: int, start_day: date):
+    #Seven days of slots
+    data = []
+    for i in range(7):
+        d = start_day + timedelta(days=i)
+        data.append({'date': d, 'slots': slots_for_doctor_date(doctor_id, d)})
+    return data
+
+def load_department_schedule(doctor_ids, start_day: date, end_day: date):
+    #Availability windows per doctor per date and the booked (doctor, date, time) set, from two bulk queries
+    windows = DoctorAvailability.query.filter(
+        DoctorAvailability.doctor_id.in_(doctor_ids),
+        DoctorAvailability.date >= start_day,
+        DoctorAvailability.date <= end_day,
+    ).all()
+    booked = set(db.session.query(Appointment.doctor_id, Appointment.date, Appointment.time).filter(
+        Appointment.doctor_id.in_(doctor_ids),
+        Appointment.date >= start_day,
+        Appointment.date <= end_day,
+        Appointment.status == 'Booked',
+    ).all())
+    by_doctor = defaultdict(lambda: defaultdict(list))
+    for w in windows:
+        by_doctor[w.doctor_id][w.date].append((w.start_time, w.end_time))
+    return by_doctor, booked
+
+def doctor_slot_stream(doctor_id: int, windows_by_date, booked, from_time: str, to_time: str):
+    #Free (date, time, doctor_id) in order; each day is only expanded when the consumer reaches it
+    #Same cut-off as slots_for_doctor_date, so every offered slot can actually be booked
+    today = date.today()
+    now_time = datetime.now().time()
+    for d in sorted(windows_by_date):
+        day = set()
+        for start, end in windows_by_date[d]:
+            for t in time_range_slots(start, end):
+                if not (from_time <= t < to_time) or (doctor_id, d, t) in booked:
+                    continue
+                if d == today and parse_hhmm(t) < now_time:
+                    continue
+                day.add(t)
+        for t in sorted(day):
+            yield d, t, doctor_id
+
+def first_available_in_department(dept_id: int, start_day: date, end_day: date,
+                                  from_time: str = '00:00', to_time: str = '24:00', limit: int = 10):
+    #Earliest free slots across all active doctors of a department.
+    #heapq.merge pulls from the per-doctor streams lazily, so days past the
+    #first `limit` slots are never expanded.
+    doctors = {d.id: d for d in Doctor.query.filter_by(department_id=dept_id, is_active=True).all()}
+    if not doctors:
+        return []
+    start_day = max(start_day, date.today())
+    by_doctor, booked = load_department_schedule(list(doctors), start_day, end_day)
+    streams = [doctor_slot_stream(doctor_id, windows, booked, from_time, to_time)
+               for doctor_id, windows in by_doctor.items()]
+    return [{'date': d, 'time': t, 'doctor': doctors[doctor_id]}
+            for d, t, doctor_id in islice(heapq.merge(*streams), limit)]
+
+HISTORY_PAGE_SIZE = 20
+ROSTER_PAGE_SIZE = 15
+HISTORY_PREVIEW_CHARS = 120
+
+def encode_history_cursor(entry):
+    #Position of the oldest entry on a page: date|time|appointment id
+    return f"{entry['date'].isoformat()}|{entry['time']}|{entry['appointment_id']}"
+
+def decode_history_cursor(cursor):
+    try:
+        d, t, aid = cursor.split('|')
+        return datetime.strptime(d, '%Y-%m-%d').date(), t, int(aid)
+    except (AttributeError, ValueError):
+        return None
+
+def roster_entry(doctor_id: int, patient_id: int):
+    #The doctor's roster row for a patient, created with no visits on their first booking
+    summary = DoctorPatientSummary.query.filter_by(doctor_id=doctor_id, patient_id=patient_id).first()
+    if not summary:
+        summary = DoctorPatientSummary(doctor_id=doctor_id, patient_id=patient_id, visit_count=0)
+        db.session.add(summary)
+    return summary
+
+def record_visit(appointment):
+    #Keep the doctor's roster row in step with a newly completed appointment
+    summary = roster_entry(appointment.doctor_id, appointment.patient_id)
+    summary.visit_count += 1
+    if summary.last_visit is None or appointment.date > summary.last_visit:
+        summary.last_visit = appointment.date
+
+def has_care_relationship(doctor_id: int, patient_id: int) -> bool:
+    #A doctor may read a patient's history once they have had any appointment together
+    return db.session.query(
+        Appointment.query.filter_by(doctor_id=doctor_id, patient_id=patient_id).exists()
+    ).scalar()
+
+def history_timeline(patient_id: int, before=None, limit: int = HISTORY_PAGE_SIZE, preview: int = HISTORY_PREVIEW_CHARS):
+    #One page of completed visits across all doctors, newest first.
+    #Keyset pagination on (date, time, id) so older pages cost the same as the first one.
+    #With preview > 0 only the first `preview` chars of the text fields are fetched.
+    def text_col(col):
+        if preview:
+            return func.substr(col, 1, preview), func.length(col)
+        return col, func.length(col)
+
+    diagnosis, diagnosis_len = text_col(Treatment.diagnosis)
+    prescription, prescription_len = text_col(Treatment.prescription)
+    notes, notes_len = text_col(Treatment.notes)
+    q = (
+        db.session.query(
+            Appointment.id, Appointment.date, Appointment.time,
+            Doctor.name, Department.name,
+            diagnosis, diagnosis_len, prescription, prescription_len, notes, notes_len,
+        )
+        .join(Doctor, Doctor.id == Appointment.doctor_id)
+        .join(Department, Department.id == Doctor.department_id)
+        .join(Treatment, Treatment.appointment_id == Appointment.id)
+        .filter(Appointment.patient_id == patient_id, Appointment.status == 'Completed')
+    )
+    pos = decode_history_cursor(before) if before else None
+    if pos:
+        d, t, aid = pos
+        q = q.filter(or_(
+            Appointment.date < d,
+            and_(Appointment.date == d, Appointment.time < t),
+            and_(Appointment.date == d, Appointment.time == t, Appointment.id < aid),
+        ))
+    rows = (
+        q.order_by(Appointment.date.desc(), Appointment.time.desc(), Appointment.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    entries = []
+    for (aid, d, t, doctor_name, dept_name,
+         diag, diag_len, presc, presc_len, nts, nts_len) in rows[:limit]:
+        entries.append({
+            'appointment_id': aid,
+            'date': d,
+            'time': t,
+            'doctor': doctor_name,
+            'department': dept_name,
+            'diagnosis': diag,
+            'prescription': presc,
+            'notes': nts,
+            'truncated': {
+                'diagnosis': bool(preview) and (diag_len or 0) > preview,
+                'prescription': bool(preview) and (presc_len or 0) > preview,
+                'notes': bool(preview) and (nts_len or 0) > preview,
+            },
+        })
+    next_cursor = encode_history_cursor(entries[-1]) if len(rows) > limit else None
+    return entries, next_cursor
+
+def rebuild_doctor_patient_summary():
+    #Rebuild the roster table from all appointments in one grouped INSERT ... SELECT.
+    #Every doctor/patient pair gets a row; only completed appointments count as visits.
+    DoctorPatientSummary.query.delete()
+    completed = Appointment.status == 'Completed'
+    aggregate = (
+        db.select(Appointment.doctor_id, Appointment.patient_id,
+                  func.count(case((completed, 1))),
+                  func.max(case((completed, Appointment.date))))
+        .group_by(Appointment.doctor_id, Appointment.patient_id)
+    )
+    db.session.execute(
+        insert(DoctorPatientSummary).from_select(
+            ['doctor_id', 'patient_id', 'visit_count', 'last_visit'], aggregate)
+    )
@@ -63,6 +63,7 @@ class Patient(db.Model):
 
 class Appointment(db.Model):
     __tablename__ = 'appointment'
+    __table_args__ = (db.Index('ix_appointment_patient_date', 'patient_id', 'date', 'time'),)
     id = db.Column(db.Integer, primary_key=True)
     patient_id = db.Column(db.Integer, db.ForeignKey('patient.id'), nullable=False)
     doctor_id = db.Column(db.Integer, db.ForeignKey('doctor.id'), nullable=False)
@@ -89,3 +90,26 @@ class DoctorAvailability(db.Model):
     start_time = db.Column(db.String(10), nullable=False)
     end_time = db.Column(db.String(10), nullable=False)
     is_available = db.Column(db.Boolean, default=True)
+
+class DoctorPatientSummary(db.Model):
+    __tablename__ = 'doctor_patient_summary'
+    __table_args__ = (db.UniqueConstraint('doctor_id', 'patient_id'),
+                      db.Index('ix_doctor_patient_summary_recent', 'doctor_id', 'last_visit'))
+    id = db.Column(db.Integer, primary_key=True)
+    doctor_id = db.Column(db.Integer, db.ForeignKey('doctor.id'), nullable=False)
+    patient_id = db.Column(db.Integer, db.ForeignKey('patient.id'), nullable=False)
+    visit_count = db.Column(db.Integer, nullable=False, default=0)
+    last_visit = db.Column(db.Date)
+    patient = db.relationship('Patient')
+
+class AuditLog(db.Model):
+    __tablename__ = 'audit_log'
+    __table_args__ = (db.Index('ix_audit_log_entity', 'entity_type', 'entity_id', 'created_at'),
+                      db.Index('ix_audit_log_type_time', 'entity_type', 'created_at'))
+    id = db.Column(db.Integer, primary_key=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    entity_type = db.Column(db.String(40), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    action = db.Column(db.String(10), nullable=False)
+    actor = db.Column(db.String(40))
+    changes = db.Column(db.Text)